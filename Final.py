@@ -4,7 +4,11 @@ from langchain.llms import OpenAI
 from dotenv import load_dotenv
 import os
 import csv
+import json
+import hashlib
 from googleapiclient.discovery import build
+from resource_links import validate_resources
+from multi_search import multi_search_tool, run_queries
 
 
 
@@ -44,7 +48,113 @@ def google_search(query):
 
 
 
+# Records every query an agent sends to the search tool together with the result text,
+# so a stage's output can be tied to the search results that actually fed it.
+# Each stage's agent gets its own recorder so recordings never mix between stages.
+class SearchRecorder:
+   def __init__(self, search_func):
+       self.search_func = search_func
+       self.results = {}
+
+
+   def __call__(self, query):
+       result = self.search_func(query)
+       self.results[query] = result
+       return result
+
+
+   def reset(self):
+       self.results = {}
+
+
+
+
+def content_hash(*parts):
+   # Equal inputs always serialize to the same JSON, and therefore to the same key
+   payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+   return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+
+
+def search_fingerprints(results):
+   return {query: hashlib.sha256(result.encode("utf-8")).hexdigest() for query, result in results.items()}
+
+
+
+
+# Content-addressed store of stage outputs: each output is saved under a hash of the
+# stage name, its prompt version and its inputs, so a refresh only re-runs changed stages
+class StageCache:
+   def __init__(self, cache_dir=".stage_cache"):
+       self.cache_dir = cache_dir
+       os.makedirs(cache_dir, exist_ok=True)
+       self.executed = []
+       self.skipped = []
+
+
+   def _path(self, key):
+       return os.path.join(self.cache_dir, f"{key}.json")
+
+
+   def get(self, key):
+       path = self._path(key)
+       if not os.path.exists(path):
+           return None
+       # A corrupt or partial entry is a cache miss: the stage re-runs and overwrites it
+       try:
+           with open(path, encoding="utf-8") as file:
+               return json.load(file)
+       except (OSError, ValueError):
+           return None
+
+
+   def put(self, key, value):
+       # Write to a temporary file first so an interrupted run never leaves a half-written entry
+       path = self._path(key)
+       with open(path + ".tmp", mode="w", encoding="utf-8") as file:
+           json.dump(value, file, ensure_ascii=False)
+       os.replace(path + ".tmp", path)
+
+
+   def run_search_stage(self, stage, prompt_version, inputs, recorder, compute):
+       # The agent decides its own queries, so remember them and re-issue them on the next run:
+       # a few search calls are far cheaper than the full LLM reasoning loop.
+       # The recorder must belong to this stage's agent alone.
+       queries_key = content_hash(stage, prompt_version, "queries", inputs)
+       previous = self.get(queries_key)
+       if previous is not None:
+           # Re-issue the queries in parallel, like MultiSearch did; a failed query counts as a change
+           queries = previous["queries"]
+           results = run_queries(queries, recorder.search_func)
+           if any(isinstance(result, Exception) for result in results):
+               cached = None
+           else:
+               cached = self.get(content_hash(stage, prompt_version, inputs, search_fingerprints(dict(zip(queries, results)))))
+           if cached is not None:
+               self.skipped.append(stage)
+               return cached["output"]
+
+       recorder.reset()
+       output = compute()
+       fingerprints = search_fingerprints(recorder.results)
+       self.put(content_hash(stage, prompt_version, inputs, fingerprints), {"stage": stage, "output": output})
+       self.put(queries_key, {"stage": stage, "queries": list(recorder.results)})
+       self.executed.append(stage)
+       return output
+
+
+   def report(self):
+       print(f"Stages executed: {', '.join(self.executed) or 'none'}")
+       print(f"Stages reused from cache: {', '.join(self.skipped) or 'none'}")
+
+
+
+
 class IndustryResearchAgent:
+   # Bump a stage's prompt version whenever its prompt changes so stored outputs are not reused
+   PROMPT_VERSION = "2"
+
    def __init__(self, llm, tools):
        self.agent = initialize_agent(
            tools=tools,
@@ -54,42 +164,31 @@ class IndustryResearchAgent:
        )
 
 
-   def gather_information(self, company_name_or_sector):
+   def gather_information(self, company_name_or_sector, callbacks=None):
        prompt = f"Research the company or industry '{company_name_or_sector}'. " \
                 "Find information like its industry, key offerings, strategic focus areas, " \
-                "and any relevant news or reports. Summarize the findings concisely."
-       return self.agent.run(prompt)
+                "and any relevant news or reports. Summarize the findings concisely. " \
+                "Use MultiSearch to look up several of these aspects in a single step."
+       return self.agent.run(prompt, callbacks=callbacks)
 
 
 
 
-# Define the LLM and tools
-tools = [
-   Tool(
+# Define the search tool, bound to the recorder of the stage whose agent uses it
+def search_tool(recorder):
+   return Tool(
        name="Search",
-       func=google_search,
+       func=recorder,
        description="For when you need to search for something.",
-   ),
-]
-
-
-# Initialize the LLM
-llm = OpenAI(openai_api_key=api_key)
-
-
-# Initialize the agent
-industry_research_agent = IndustryResearchAgent(llm, tools)
-
-
-# Example usage
-company_name = "Waitrose"
-company_info = industry_research_agent.gather_information(company_name)
+   )
 
 
 
 
 # Usecase Generation using company information
 class UseCaseGenerationAgent:
+   PROMPT_VERSION = "1"
+
    def __init__(self, llm, tools):
        self.agent = initialize_agent(
            tools=tools,
@@ -113,18 +212,10 @@ class UseCaseGenerationAgent:
 
 
 
-# Initialize the agent with the LLM and tools
-use_case_agent = UseCaseGenerationAgent(llm, tools)
-
-
-# Generate AI/ML use cases for the given company summary
-generated_use_cases = use_case_agent.generate_use_cases(company_info)
-
-
-
-
 # Resource Collection Agent
 class ResourceCollectionAgent:
+   PROMPT_VERSION = "1"
+
    def __init__(self, llm, tools):
        self.agent = initialize_agent(
            tools=tools,
@@ -150,6 +241,8 @@ class ResourceCollectionAgent:
 
 # Solution Proposal Agent
 class SolutionProposalAgent:
+   PROMPT_VERSION = "1"
+
    def __init__(self, llm, tools):
        self.agent = initialize_agent(
            tools=tools,
@@ -188,55 +281,113 @@ class SolutionProposalAgent:
 
 
 
-# Initialize agents
-resource_collection_agent = ResourceCollectionAgent(llm, tools)
-solution_proposal_agent = SolutionProposalAgent(llm, tools)
+# Run the pipeline only when executed as a script, so the agents can be imported elsewhere
+if __name__ == "__main__":
+   # Initialize the LLM
+   llm = OpenAI(openai_api_key=api_key)
+
+
+   # Initialize the agent; MultiSearch lets it research several aspects per iteration
+   research_recorder = SearchRecorder(google_search)
+   industry_research_agent = IndustryResearchAgent(
+      llm, [search_tool(research_recorder), multi_search_tool(research_recorder)]
+   )
+
+
+   # Stage outputs are reused across runs as long as their inputs have not changed
+   stage_cache = StageCache()
+
+
+   # Example usage
+   company_name = "Waitrose"
+   company_info = stage_cache.run_search_stage(
+      "gather_information", IndustryResearchAgent.PROMPT_VERSION, company_name, research_recorder,
+      lambda: industry_research_agent.gather_information(company_name)
+   )
+
+
+
+
+   # Initialize the agent with the LLM and tools
+   use_case_recorder = SearchRecorder(google_search)
+   use_case_agent = UseCaseGenerationAgent(llm, [search_tool(use_case_recorder)])
+
+
+   # Generate AI/ML use cases for the given company summary
+   generated_use_cases = stage_cache.run_search_stage(
+      "generate_use_cases", UseCaseGenerationAgent.PROMPT_VERSION, company_info, use_case_recorder,
+      lambda: use_case_agent.generate_use_cases(company_info)
+   )
+
+
+
+
+   # Initialize agents
+   resource_recorder = SearchRecorder(google_search)
+   solution_recorder = SearchRecorder(google_search)
+   resource_collection_agent = ResourceCollectionAgent(llm, [search_tool(resource_recorder)])
+   solution_proposal_agent = SolutionProposalAgent(llm, [search_tool(solution_recorder)])
+
+
+   # Collect relevant resources for the use cases
+   resources = stage_cache.run_search_stage(
+      "find_relevant_resources", ResourceCollectionAgent.PROMPT_VERSION, generated_use_cases, resource_recorder,
+      lambda: resource_collection_agent.find_relevant_resources(generated_use_cases)
+   )
+
+   # Check the links in the collected resource text; the text itself is kept for the CSV
+   validated_links = validate_resources(resources)
 
 
-# Collect relevant resources for the use cases
-resources = resource_collection_agent.find_relevant_resources(generated_use_cases)
+   # Propose GenAI solutions based on the use cases and company summary
+   genai_solutions = stage_cache.run_search_stage(
+      "propose_genai_solutions", SolutionProposalAgent.PROMPT_VERSION, [generated_use_cases, company_info], solution_recorder,
+      lambda: solution_proposal_agent.propose_genai_solutions(generated_use_cases, company_info)
+   )
 
+   # Report which stages were re-run and which were reused on this refresh
+   stage_cache.report()
 
-# Propose GenAI solutions based on the use cases and company summary
-genai_solutions = solution_proposal_agent.propose_genai_solutions(generated_use_cases, company_info)
 
 
 
+   # Prepare the CSV data
+   csv_data = []
+   company_name = "Waitrose"  # Example, could be dynamic
 
-# Prepare the CSV data
-csv_data = []
-company_name = "Waitrose"  # Example, could be dynamic
 
+   # Usecases: Joining each item with '\n' for better readability
+   use_cases_str = "\n".join(generated_use_cases)
 
-# Usecases: Joining each item with '\n' for better readability
-use_cases_str = "\n".join(generated_use_cases)
 
+   # Resource Collections: Formatted with each use case and its associated links
+   resources_str = "\n".join([f"{use_case}:\n- " + "\n- ".join(links) for use_case, links in resources.items()])
 
-# Resource Collections: Formatted with each use case and its associated links
-resources_str = "\n".join([f"{use_case}:\n- " + "\n- ".join(links) for use_case, links in resources.items()])
 
+   # Validated Links: The working links found in each use case's resources
+   links_str = "\n".join([f"{use_case}:\n- " + "\n- ".join(links) for use_case, links in validated_links.items()])
 
-# GenAI Solutions: List of solutions, each on a new line
-solutions_str = "\n".join(genai_solutions)
 
+   # GenAI Solutions: List of solutions, each on a new line
+   solutions_str = "\n".join(genai_solutions)
 
-# Append the formatted data
-csv_data.append([company_name, use_cases_str, resources_str, solutions_str])
 
+   # Append the formatted data
+   csv_data.append([company_name, use_cases_str, resources_str, links_str, solutions_str])
 
-# Write to CSV with proper formatting
-csv_file = "company_research_output.csv"
-csv_header = ["Company_name", "Usecases", "Resource_Collections", "Solution_Proposed"]
 
+   # Write to CSV with proper formatting
+   csv_file = "company_research_output.csv"
+   csv_header = ["Company_name", "Usecases", "Resource_Collections", "Validated_Links", "Solution_Proposed"]
 
-# Write header and data to the CSV file
-with open(csv_file, mode="w", newline="", encoding="utf-8") as file:
-   writer = csv.writer(file)
-   writer.writerow(csv_header)  # Write the header
-   writer.writerows(csv_data)  # Write the collected data
 
+   # Write header and data to the CSV file
+   with open(csv_file, mode="w", newline="", encoding="utf-8") as file:
+      writer = csv.writer(file)
+      writer.writerow(csv_header)  # Write the header
+      writer.writerows(csv_data)  # Write the collected data
 
-print(f"Data has been written to {csv_file}")
 
+   print(f"Data has been written to {csv_file}")
 
 
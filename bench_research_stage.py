@@ -0,0 +1,120 @@
+"""
+Compares the research stage with and without the MultiSearch tool.
+
+Runs IndustryResearchAgent.gather_information against a fake search backend and reports
+the number of agent iterations and the wall time for each tool set.
+
+    python bench_research_stage.py               # offline, with a rule-based stand-in LLM
+    python bench_research_stage.py --llm openai  # real model, still with the fake search backend
+
+The offline LLM reads the real agent prompt and uses MultiSearch only when the tool is
+offered and the prompt asks for it, so it checks the prompt and tool wiring. Whether a real
+model batches its queries can only be measured with --llm openai.
+"""
+import argparse
+import re
+import threading
+import time
+
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.llms.base import LLM
+
+from Final import IndustryResearchAgent, SearchRecorder, api_key, search_tool
+from multi_search import multi_search_tool
+
+
+# The aspects IndustryResearchAgent's prompt asks the agent to cover
+ASPECTS = ["industry", "key offerings", "strategic focus areas", "news"]
+
+
+class FakeSearchBackend:
+    # Stands in for the Custom Search API offline: answers every query after a fixed delay
+    def __init__(self, latency=0.5, results_per_query=3):
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        slug = re.sub(r"\W+", "-", query.lower()).strip("-")
+        return "\n".join(
+            f"{query} result {i}: https://example.com/{slug}/{i}" for i in range(1, self.results_per_query + 1)
+        )
+
+
+class RuleBasedResearchLLM(LLM):
+    # Offline stand-in for the model: covers each aspect once, batching them into a single
+    # MultiSearch action when the agent offers that tool and the question asks for it
+    company: str
+
+    @property
+    def _llm_type(self):
+        return "rule-based-research"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        instructions, _, question = prompt.rpartition("Question:")
+        offered = re.search(r"should be one of \[([^\]]*)\]", instructions)
+        tool_names = [name.strip() for name in offered.group(1).split(",")] if offered else []
+        searched = question.count("Observation:")
+        if "MultiSearch" in tool_names and "MultiSearch" in question:
+            if searched == 0:
+                queries = "; ".join(f"{self.company} {aspect}" for aspect in ASPECTS)
+                return f" I should look up every aspect at once.\nAction: MultiSearch\nAction Input: {queries}"
+        elif searched < len(ASPECTS):
+            aspect = ASPECTS[searched]
+            return f" I should look up the {aspect}.\nAction: Search\nAction Input: {self.company} {aspect}"
+        return f" I now know the final answer.\nFinal Answer: Summary of the research on {self.company}."
+
+
+class AgentStepCounter(BaseCallbackHandler):
+    # Counts the Thought/Action/Observation round trips an agent takes
+    def __init__(self):
+        self.steps = 0
+
+    def on_agent_action(self, action, **kwargs):
+        self.steps += 1
+
+
+def measure_research_stage(agent, company_name):
+    """
+    Measures the agent iterations and wall time of one research run.
+
+    Args:
+        agent: An IndustryResearchAgent.
+        company_name: The company or sector to research.
+
+    Returns:
+        A tuple of (number of agent iterations, wall time in seconds).
+    """
+    counter = AgentStepCounter()
+    start = time.perf_counter()
+    agent.gather_information(company_name, callbacks=[counter])
+    return counter.steps, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--company", default="Waitrose")
+    parser.add_argument("--llm", choices=["offline", "openai"], default="offline")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake search latency in seconds")
+    args = parser.parse_args()
+
+    if args.llm == "openai":
+        from langchain.llms import OpenAI
+        llm = OpenAI(openai_api_key=api_key)
+    else:
+        llm = RuleBasedResearchLLM(company=args.company)
+
+    for name, with_multi_search in [("Search", False), ("Search + MultiSearch", True)]:
+        backend = FakeSearchBackend(latency=args.latency)
+        recorder = SearchRecorder(backend)
+        tools = [search_tool(recorder)] + ([multi_search_tool(recorder)] if with_multi_search else [])
+        steps, wall_time = measure_research_stage(IndustryResearchAgent(llm, tools), args.company)
+        print(f"{name}: {steps} iterations, {backend.calls} searches, {wall_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
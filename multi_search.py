@@ -0,0 +1,96 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain.agents import Tool
+
+
+# Queries can be separated by semicolons or put on separate lines
+QUERY_SEPARATOR = re.compile(r"[;\n]")
+
+NO_RESULTS = "No results found."
+
+
+def split_queries(action_input):
+    queries = []
+    for query in QUERY_SEPARATOR.split(action_input):
+        query = query.strip().strip("\"'")
+        if query and query not in queries:
+            queries.append(query)
+    return queries
+
+
+def describe_error(error):
+    # Never use str(error): googleapiclient's HttpError includes the request URL, API key included
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status is None:
+        return type(error).__name__
+    reason = getattr(error, "reason", None)
+    return f"{type(error).__name__} {status}" + (f" ({reason})" if reason else "")
+
+
+def run_queries(queries, search_func, max_workers=4):
+    """
+    Runs search queries in parallel on a thread pool.
+
+    A query that raises (e.g. a quota or server error from the search API) does not affect the others.
+
+    Args:
+        queries: A list of search queries.
+        search_func: A single-query search function.
+        max_workers: The maximum number of queries in flight at once.
+
+    Returns:
+        A list with, for each query, its result text or the exception it raised.
+    """
+    def run_query(query):
+        try:
+            return search_func(query)
+        except Exception as error:
+            return error
+
+    if not queries:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+        return list(executor.map(run_query, queries))
+
+
+def multi_search(action_input, search_func, max_workers=4):
+    """
+    Runs several search queries in parallel and merges them into one observation.
+
+    Args:
+        action_input: The queries, separated by semicolons or new lines.
+        search_func: A single-query search function returning one result per line.
+        max_workers: The maximum number of queries in flight at once.
+
+    Returns:
+        The results grouped by query, with results already seen under an earlier query removed
+        and an error note in place of the results of any query that failed.
+    """
+    queries = split_queries(action_input)
+    if not queries:
+        return NO_RESULTS
+
+    seen = set()
+    sections = []
+    for query, result in zip(queries, run_queries(queries, search_func, max_workers)):
+        if isinstance(result, Exception):
+            sections.append(f"Results for '{query}':\nSearch failed: {describe_error(result)}")
+            continue
+        lines = []
+        for line in result.splitlines():
+            line = line.strip()
+            if line and line != NO_RESULTS and line not in seen:
+                seen.add(line)
+                lines.append(line)
+        sections.append(f"Results for '{query}':\n" + ("\n".join(lines) if lines else NO_RESULTS))
+    return "\n\n".join(sections)
+
+
+def multi_search_tool(search_func, max_workers=4):
+    return Tool(
+        name="MultiSearch",
+        func=lambda action_input: multi_search(action_input, search_func, max_workers),
+        description="For when you need to search for several things at once. "
+                    "Input should be the search queries separated by semicolons.",
+    )
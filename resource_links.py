@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+
+
+# Matches http(s) links inside free-form agent output; parentheses are allowed so links like
+# Wikipedia's Foo_(bar) survive, and unbalanced closing ones are trimmed afterwards
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'\[\]{}]+", re.IGNORECASE)
+
+# Punctuation that usually ends the sentence rather than the link
+TRAILING_PUNCTUATION = ".,;:!?*"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Sites like Kaggle and Google Scholar block the default aiohttp client, so present as a browser
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+}
+
+# Appended to links that could not be checked this time (timeouts, rate limits, server errors)
+UNVERIFIED = "(not verified)"
+
+
+def trim_url(url):
+    # Drop sentence punctuation and closing brackets that belong to the surrounding text
+    while True:
+        trimmed = url.rstrip(TRAILING_PUNCTUATION)
+        if trimmed.endswith(")") and trimmed.count(")") > trimmed.count("("):
+            trimmed = trimmed[:-1]
+        if trimmed == url:
+            return url
+        url = trimmed
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL so the same resource written in different ways is only validated once.
+
+    Args:
+        url: A raw http(s) URL.
+
+    Returns:
+        The URL with a lowercase scheme and host, no default port, no bare "/" path and no
+        fragment, or None if the URL is malformed (e.g. a placeholder like http://host:port/).
+    """
+    try:
+        parts = urlsplit(trim_url(url))
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    # Only the root path is dropped; other trailing slashes can be significant to the server
+    path = "" if parts.path == "/" else parts.path
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+def extract_urls(lines):
+    """
+    Extracts normalized, de-duplicated URLs from the lines an agent returned.
+
+    Args:
+        lines: A list of text lines, as stored by find_relevant_resources.
+
+    Returns:
+        A list of URLs in the order they first appear.
+    """
+    urls = []
+    for line in lines:
+        for match in URL_PATTERN.findall(line):
+            url = normalize_url(match)
+            if url is not None and url not in urls:
+                urls.append(url)
+    return urls
+
+
+class LinkValidationCache:
+    # Persists validation results between runs so known links are not checked again until they expire
+    def __init__(self, path="link_validation_cache.json", max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.entries = {}
+        if os.path.exists(path):
+            # An unreadable cache only costs a re-check, so start empty instead of failing the run
+            try:
+                with open(path, encoding="utf-8") as file:
+                    entries = json.load(file)
+            except (OSError, ValueError):
+                entries = {}
+            self.entries = entries if isinstance(entries, dict) else {}
+
+    def get(self, url):
+        entry = self.entries.get(url)
+        if entry is None or time.time() - entry["checked_at"] > self.max_age:
+            return None
+        return entry
+
+    def put(self, url, status, ok):
+        self.entries[url] = {"status": status, "ok": ok, "checked_at": time.time()}
+
+    def save(self):
+        with open(self.path + ".tmp", mode="w", encoding="utf-8") as file:
+            json.dump(self.entries, file, indent=2)
+        os.replace(self.path + ".tmp", self.path)
+
+
+def link_state(status):
+    # True if the link exists, False if it is broken, None if this check could not tell
+    if status is None or status == 429 or status >= 500:
+        return None
+    # Login walls and bot blocks that persist after the GET fallback still mean the page exists
+    return status < 400 or status in (401, 403)
+
+
+async def check_url(session, url):
+    # Some sites reject HEAD requests, so fall back to GET before judging the link
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            status = response.status
+        if status in (401, 403, 405, 501):
+            async with session.get(url, allow_redirects=True) as response:
+                status = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        # ValueError also covers malformed hosts rejected by yarl or IDNA encoding
+        return None
+    return status
+
+
+async def validate_urls(urls, cache, max_connections=20, per_host_limit=4, timeout=10):
+    """
+    Validates URLs concurrently over a shared, pooled HTTP session.
+
+    Args:
+        urls: An iterable of normalized URLs.
+        cache: A LinkValidationCache holding earlier results.
+        max_connections: The maximum number of open connections overall.
+        per_host_limit: The maximum number of concurrent connections to a single host.
+        timeout: The connect and read timeout in seconds for each request; time spent waiting
+            for a free connection in the pool does not count.
+
+    Returns:
+        A dictionary mapping each URL to True if the link exists, False if it is broken and None
+        if it could not be checked this time.
+    """
+    results = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        entry = cache.get(url)
+        if entry is not None:
+            results[url] = entry["ok"]
+        else:
+            pending.append(url)
+
+    if pending:
+        connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=per_host_limit)
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=client_timeout, headers=REQUEST_HEADERS
+        ) as session:
+            statuses = await asyncio.gather(*(check_url(session, url) for url in pending), return_exceptions=True)
+        for url, status in zip(pending, statuses):
+            state = link_state(status if isinstance(status, int) else None)
+            # Timeouts, rate limits and server errors say nothing lasting about the link, so they
+            # are not cached and the link is checked again on the next run
+            if state is not None:
+                cache.put(url, status, state)
+            results[url] = state
+        cache.save()
+
+    return results
+
+
+def validate_resources(resources, cache=None, **kwargs):
+    """
+    Extracts the links from the text collected for each use case and keeps those that work.
+
+    Links shared between use cases are validated only once. Links that could not be checked
+    are kept and marked as not verified rather than dropped.
+
+    Args:
+        resources: A dictionary mapping use cases to lists of text lines.
+        cache: A LinkValidationCache; a default file-backed cache is used if omitted.
+        **kwargs: Connection limits and timeout passed on to validate_urls.
+
+    Returns:
+        A dictionary mapping use cases to lists of links, or ["NA"] if none remain.
+    """
+    cache = cache if cache is not None else LinkValidationCache()
+    links = {use_case: extract_urls(lines) for use_case, lines in resources.items()}
+    all_urls = [url for urls in links.values() for url in urls]
+    results = asyncio.run(validate_urls(all_urls, cache, **kwargs))
+
+    validated = {}
+    for use_case, urls in links.items():
+        kept = [url if results[url] else f"{url} {UNVERIFIED}" for url in urls if results[url] is not False]
+        validated[use_case] = kept if kept else ["NA"]
+    return validated
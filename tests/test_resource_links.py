@@ -0,0 +1,184 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from resource_links import LinkValidationCache, extract_urls, normalize_url, validate_resources
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Routes: /ok/* answers 200, /slow/* answers 200 after a delay, /no-head answers 405 to HEAD
+    # but 200 to GET, /forbidden always 403, /unavailable always 503, everything else 404
+    def do_HEAD(self):
+        self.server.record(self.command, self.path, self.headers.get("User-Agent"))
+        if self.path.startswith("/slow/"):
+            time.sleep(self.server.slow_delay)
+        if self.path == "/no-head":
+            self.respond(405)
+        elif self.path.startswith(("/ok/", "/slow/")):
+            self.respond(200)
+        else:
+            self.respond_other()
+        self.server.finish_request_count()
+
+    def do_GET(self):
+        self.server.record(self.command, self.path, self.headers.get("User-Agent"))
+        if self.path == "/no-head":
+            self.respond(200)
+        else:
+            self.respond_other()
+        self.server.finish_request_count()
+
+    def respond_other(self):
+        self.respond({"/forbidden": 403, "/unavailable": 503}.get(self.path, 404))
+
+    def respond(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.requests = []
+        self.user_agents = set()
+        self.slow_delay = 0.2
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def record(self, method, path, user_agent):
+        with self.lock:
+            self.requests.append((method, path))
+            self.user_agents.add(user_agent)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finish_request_count(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "link_validation_cache.json")
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_extract_urls_normalizes_and_deduplicates():
+    lines = [
+        "1. Kaggle Dataset (https://www.kaggle.com/eemlcommunity/predictive-maintenance).",
+        "See https://en.wikipedia.org/wiki/Foo_(bar), HTTPS://GitHub.com:443/#readme",
+        "and https://github.com again, or https://example.com/search/?q=1",
+    ]
+    assert extract_urls(lines) == [
+        "https://www.kaggle.com/eemlcommunity/predictive-maintenance",
+        "https://en.wikipedia.org/wiki/Foo_(bar)",
+        "https://github.com",
+        "https://example.com/search/?q=1",
+    ]
+
+
+@pytest.mark.parametrize("url", ["http://localhost:99999/x", "http://host:abc/", "https://[::1/", "http://host:port/path"])
+def test_malformed_urls_are_skipped(url):
+    assert normalize_url(url) is None
+    assert extract_urls([f"Try {url} first"]) == []
+
+
+def test_validate_resources_against_stand_in_server(server, cache_path):
+    base = server.base_url
+    resources = {
+        "Chatbot": [f"Dataset: {base}/ok/a and {base}/missing.", "Prose without any links."],
+        "Maintenance": [f"{base}/ok/a", f"{base}/no-head", f"Scholar: {base}/forbidden"],
+        "Recommendations": ["The final answer is the set of resources identified above."],
+        "Forecasting": [f"{base}/unavailable"],
+    }
+
+    validated = validate_resources(resources, LinkValidationCache(cache_path))
+
+    assert validated == {
+        "Chatbot": [f"{base}/ok/a"],
+        "Maintenance": [f"{base}/ok/a", f"{base}/no-head", f"{base}/forbidden"],
+        "Recommendations": ["NA"],
+        "Forecasting": [f"{base}/unavailable (not verified)"],
+    }
+    # The link shared by two use cases is checked once, and HEAD falls back to GET on 405 and 403
+    assert server.requests.count(("HEAD", "/ok/a")) == 1
+    assert ("GET", "/no-head") in server.requests
+    assert ("GET", "/forbidden") in server.requests
+    assert all(user_agent.startswith("Mozilla/") for user_agent in server.user_agents)
+
+
+def test_per_host_limit(server, cache_path):
+    resources = {"Use case": [f"{server.base_url}/slow/{i}" for i in range(6)]}
+
+    validate_resources(resources, LinkValidationCache(cache_path), per_host_limit=2)
+
+    assert server.max_in_flight == 2
+
+
+def test_waiting_for_a_connection_does_not_count_towards_the_timeout(server, cache_path):
+    server.slow_delay = 0.4
+    urls = [f"{server.base_url}/slow/{i}" for i in range(6)]
+
+    validated = validate_resources({"Use case": urls}, LinkValidationCache(cache_path), per_host_limit=2, timeout=1)
+
+    assert validated == {"Use case": urls}
+
+
+def test_server_errors_are_not_cached(server, cache_path):
+    url = f"{server.base_url}/unavailable"
+
+    validate_resources({"Use case": [url]}, LinkValidationCache(cache_path))
+
+    assert LinkValidationCache(cache_path).get(url) is None
+
+
+def test_cache_is_reused_on_rerun(server, cache_path):
+    resources = {"Use case": [f"{server.base_url}/ok/a", f"{server.base_url}/missing"]}
+    first = validate_resources(resources, LinkValidationCache(cache_path))
+    request_count = len(server.requests)
+
+    second = validate_resources(resources, LinkValidationCache(cache_path))
+
+    assert second == first
+    assert len(server.requests) == request_count
+
+
+def test_transport_failures_are_not_cached(cache_path):
+    url = f"http://127.0.0.1:{unused_port()}/ok/a"
+    cache = LinkValidationCache(cache_path)
+
+    assert validate_resources({"Use case": [url]}, cache) == {"Use case": [f"{url} (not verified)"]}
+    assert LinkValidationCache(cache_path).get(url) is None
+
+
+def test_corrupt_cache_is_treated_as_empty(cache_path):
+    with open(cache_path, mode="w", encoding="utf-8") as file:
+        file.write("{not json")
+
+    assert LinkValidationCache(cache_path).entries == {}
@@ -0,0 +1,68 @@
+from Final import SearchRecorder, StageCache
+
+
+def run_research(cache, recorder, calls):
+    def compute():
+        calls.append(1)
+        recorder("waitrose industry")
+        return "summary"
+
+    return cache.run_search_stage("gather_information", "1", "Waitrose", recorder, compute)
+
+
+def test_unchanged_search_results_are_reused(tmp_path):
+    recorder = SearchRecorder(lambda query: f"{query}: https://example.com")
+    calls = []
+
+    run_research(StageCache(str(tmp_path)), recorder, calls)
+    cache = StageCache(str(tmp_path))
+    assert run_research(cache, recorder, calls) == "summary"
+
+    assert len(calls) == 1
+    assert cache.skipped == ["gather_information"]
+
+
+def test_changed_search_results_rerun_stage(tmp_path):
+    results = {"waitrose industry": "old"}
+    recorder = SearchRecorder(results.get)
+    calls = []
+
+    run_research(StageCache(str(tmp_path)), recorder, calls)
+    results["waitrose industry"] = "new"
+    cache = StageCache(str(tmp_path))
+    run_research(cache, recorder, calls)
+
+    assert len(calls) == 2
+    assert cache.executed == ["gather_information"]
+
+
+def test_failed_refresh_search_reruns_stage(tmp_path):
+    failures = []
+
+    def search(query):
+        # Fails once, on the refresh check, then recovers for the agent's own search
+        if failures:
+            raise RuntimeError(failures.pop())
+        return f"{query}: https://example.com"
+
+    recorder = SearchRecorder(search)
+    calls = []
+    run_research(StageCache(str(tmp_path)), recorder, calls)
+    failures.append("Search API unavailable")
+    run_research(StageCache(str(tmp_path)), recorder, calls)
+
+    assert len(calls) == 2
+
+
+def test_corrupt_entry_is_a_cache_miss(tmp_path):
+    recorder = SearchRecorder(lambda query: f"{query}: https://example.com")
+    calls = []
+    run_research(StageCache(str(tmp_path)), recorder, calls)
+    for entry in tmp_path.glob("*.json"):
+        entry.write_text("{partial", encoding="utf-8")
+
+    cache = StageCache(str(tmp_path))
+    assert run_research(cache, recorder, calls) == "summary"
+
+    assert len(calls) == 2
+    assert cache.executed == ["gather_information"]